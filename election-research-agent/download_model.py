@@ -1,7 +1,24 @@
 import os
+import argparse
+import json
 import requests
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 import hashlib
+import threading
+
+# Stream in 1 MiB chunks through an 8 MiB write buffer
+CHUNK_SIZE = 1 << 20
+WRITE_BUFFER_SIZE = 8 << 20
+
+# Redraw the progress bar once per 16 MiB downloaded
+PROGRESS_STEP = 16 << 20
+
+# Number of byte ranges fetched in parallel when the server supports Range requests
+NUM_RANGES = 8
+
+# AWQ int4 weights for serving with vLLM on a GPU
+AWQ_REPO_ID = "TheBloke/Llama-2-7B-Chat-AWQ"
 
 def download_model():
     """Download the quantized Llama-2 model for local usage."""
@@ -25,22 +42,260 @@ def download_model():
     print(f"Downloading {model_name}...")
     print("This might take a while depending on your internet connection.")
     
-    # Download with progress
-    response = requests.get(model_url, stream=True)
+    # Partial data lives next to the model until it is complete and verified
+    part_path = model_path.with_name(model_name + ".part")
+    total_size, accepts_ranges, expected_digest = _probe(model_url)
+    
+    if total_size and accepts_ranges:
+        _download_ranges(model_url, part_path, total_size)
+        digest = _hash_file(part_path)
+    else:
+        digest = _download_stream(model_url, part_path)
+    
+    if expected_digest and len(expected_digest) == 64:
+        if digest != expected_digest:
+            os.remove(part_path)
+            raise RuntimeError(f"Checksum mismatch for {model_name}: expected {expected_digest}, got {digest}")
+        print("\nChecksum verified.")
+    
+    os.replace(part_path, model_path)
+    print("\nDownload complete!")
+
+def download_awq_model():
+    """Download the AWQ-quantized Llama-2 model for serving with vLLM."""
+    
+    # Only this path needs huggingface_hub, so the default GGUF download works without it
+    from huggingface_hub import snapshot_download
+    
+    model_dir = Path("models") / AWQ_REPO_ID.split("/")[-1]
+    
+    print(f"Downloading {AWQ_REPO_ID} to {model_dir}...")
+    print("This might take a while depending on your internet connection.")
+    
+    # Fetches files in parallel and resumes interrupted downloads
+    snapshot_download(
+        repo_id=AWQ_REPO_ID,
+        local_dir=model_dir,
+        allow_patterns=["*.safetensors", "*.json", "*.model"],
+        max_workers=8
+    )
+    
+    print("\nDownload complete!")
+    print(f"Serve it with: vllm serve {model_dir} --quantization awq --dtype float16")
+
+def _probe(url: str):
+    """
+    Issue a HEAD request to learn the download size, Range support and expected checksum.
+    
+    Args:
+        url (str): Model URL
+    
+    Returns:
+        tuple: (content length or 0, whether byte ranges are supported, SHA-256 hex digest or None)
+    """
+    # Some hosts reject HEAD; fall back to a plain single-stream GET rather than failing
+    try:
+        response = requests.head(url, allow_redirects=True, timeout=(5, 60), headers={'Accept-Encoding': 'identity'})
+        response.raise_for_status()
+    except requests.RequestException:
+        return 0, False, None
+    
     total_size = int(response.headers.get('content-length', 0))
+    accepts_ranges = response.headers.get('accept-ranges', '').lower() == 'bytes'
     
-    with open(model_path, 'wb') as f:
-        if total_size == 0:
-            f.write(response.content)
-        else:
-            downloaded = 0
-            for data in response.iter_content(chunk_size=4096):
-                downloaded += len(data)
-                f.write(data)
+    # Hugging Face reports the SHA-256 of LFS files in the X-Linked-Etag header of the first hop
+    expected_digest = None
+    for hop in [*response.history, response]:
+        etag = hop.headers.get('x-linked-etag', '').strip('"')
+        if etag:
+            expected_digest = etag
+            break
+    
+    return total_size, accepts_ranges, expected_digest
+
+def _download_ranges(url: str, part_path: Path, total_size: int):
+    """
+    Download the file as NUM_RANGES parallel byte ranges, resuming from a previous run if possible.
+    
+    Progress is recorded in a ``.part.json`` manifest next to the partial file so an
+    interrupted download only re-requests the bytes it is missing.
+    
+    Args:
+        url (str): Model URL
+        part_path (Path): Partial file to fill in
+        total_size (int): Size of the complete file in bytes
+    """
+    manifest_path = part_path.with_name(part_path.name + ".json")
+    manifest = _load_manifest(manifest_path, url, total_size) if part_path.exists() else None
+    
+    if manifest is None:
+        range_size = -(-total_size // NUM_RANGES)
+        manifest = {
+            'url': url,
+            'size': total_size,
+            # [start, end (inclusive), bytes already written]
+            'ranges': [
+                [start, min(start + range_size, total_size) - 1, 0]
+                for start in range(0, total_size, range_size)
+            ]
+        }
+        fd = os.open(part_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0))
+        try:
+            if hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(fd, 0, total_size)
+            else:
+                os.ftruncate(fd, total_size)
+        finally:
+            os.close(fd)
+        _save_manifest(manifest_path, manifest)
+    
+    stop = threading.Event()
+    try:
+        with ThreadPoolExecutor(max_workers=len(manifest['ranges'])) as executor:
+            futures = [
+                executor.submit(_download_range, url, part_path, byte_range, stop)
+                for byte_range in manifest['ranges']
+                if byte_range[0] + byte_range[2] <= byte_range[1]
+            ]
+            pending = futures
+            try:
+                while pending:
+                    _, pending = wait(pending, timeout=1)
+                    _save_manifest(manifest_path, manifest)
+                    downloaded = sum(byte_range[2] for byte_range in manifest['ranges'])
+                    done = int(50 * downloaded / total_size)
+                    print(f"\rDownloading: [{'=' * done}{' ' * (50-done)}] {downloaded}/{total_size} bytes", end='')
+            finally:
+                # On Ctrl-C, make the workers stop after their current chunk instead of
+                # letting the executor wait for every range to finish
+                stop.set()
+            
+            # Surface any worker error
+            for future in futures:
+                future.result()
+    finally:
+        # Record everything written so far, so an interrupted run resumes from here
+        _save_manifest(manifest_path, manifest)
+    
+    os.remove(manifest_path)
+
+def _download_range(url: str, part_path: Path, byte_range: list, stop: threading.Event):
+    """
+    Fetch the missing tail of one byte range and write it at its offset in the partial file.
+    
+    Args:
+        url (str): Model URL
+        part_path (Path): Preallocated partial file
+        byte_range (list): Mutable [start, end, written] entry from the manifest
+        stop (threading.Event): Set when the download is interrupted; the range is left partial
+    """
+    if stop.is_set():
+        return
+    
+    start, end, written = byte_range
+    response = requests.get(
+        url,
+        stream=True,
+        timeout=(5, 60),
+        headers={'Range': f"bytes={start + written}-{end}", 'Accept-Encoding': 'identity'}
+    )
+    response.raise_for_status()
+    if response.status_code != 206:
+        raise RuntimeError(f"Server ignored range request for bytes {start + written}-{end}")
+    
+    # Each worker has its own descriptor and writes at explicit offsets, so no locking is needed
+    fd = os.open(part_path, os.O_WRONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        offset = start + written
+        for data in response.iter_content(chunk_size=CHUNK_SIZE):
+            if stop.is_set():
+                break
+            if hasattr(os, 'pwrite'):
+                os.pwrite(fd, data, offset)
+            else:
+                os.lseek(fd, offset, os.SEEK_SET)
+                os.write(fd, data)
+            offset += len(data)
+            byte_range[2] = offset - start
+    finally:
+        os.close(fd)
+        response.close()
+
+def _download_stream(url: str, part_path: Path) -> str:
+    """
+    Download the file over a single connection, hashing it as it streams.
+    
+    Args:
+        url (str): Model URL
+        part_path (Path): File to write
+    
+    Returns:
+        str: SHA-256 hex digest of the downloaded bytes
+    """
+    # Ask for the raw bytes so nothing is decompressed on the fly
+    response = requests.get(
+        url,
+        stream=True,
+        timeout=(5, 60),
+        headers={'Accept-Encoding': 'identity'}
+    )
+    response.raise_for_status()
+    total_size = int(response.headers.get('content-length', 0))
+    digest = hashlib.sha256()
+    
+    with open(part_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        downloaded = 0
+        last_bucket = -1
+        for data in response.iter_content(chunk_size=CHUNK_SIZE):
+            downloaded += len(data)
+            f.write(data)
+            digest.update(data)
+            
+            bucket = downloaded // PROGRESS_STEP
+            if total_size and bucket != last_bucket:
+                last_bucket = bucket
                 done = int(50 * downloaded / total_size)
                 print(f"\rDownloading: [{'=' * done}{' ' * (50-done)}] {downloaded}/{total_size} bytes", end='')
     
-    print("\nDownload complete!")
+    if total_size:
+        print(f"\rDownloading: [{'=' * 50}] {downloaded}/{total_size} bytes", end='')
+    
+    return digest.hexdigest()
+
+def _hash_file(path: Path) -> str:
+    """Compute the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb', buffering=0) as f:
+        for data in iter(lambda: f.read(WRITE_BUFFER_SIZE), b''):
+            digest.update(data)
+    return digest.hexdigest()
+
+def _load_manifest(manifest_path: Path, url: str, total_size: int):
+    """Load a resume manifest, ignoring it if it belongs to a different download."""
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (OSError, ValueError):
+        return None
+    if manifest.get('url') != url or manifest.get('size') != total_size:
+        return None
+    return manifest
+
+def _save_manifest(manifest_path: Path, manifest: dict):
+    """Atomically persist the resume manifest."""
+    tmp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+    tmp_path.write_text(json.dumps(manifest))
+    os.replace(tmp_path, manifest_path)
 
 if __name__ == "__main__":
-    download_model()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Download the local Llama-2 chat model.")
+    parser.add_argument(
+        "--awq",
+        action="store_true",
+        help="download the AWQ int4 weights for vLLM instead of the llama.cpp GGUF file"
+    )
+    args = parser.parse_args()
+    
+    if args.awq:
+        download_awq_model()
+    else:
+        download_model()
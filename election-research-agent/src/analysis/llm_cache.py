@@ -0,0 +1,230 @@
+from typing import Dict, List, Any, Optional, Sequence
+import hashlib
+import json
+import logging
+import diskcache
+from langchain.schema import AIMessage, BaseMessage, ChatGeneration, LLMResult
+import numpy as np
+
+try:
+    import faiss
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # Semantic tier is optional
+    faiss = None
+    SentenceTransformer = None
+
+# Default on-disk location of the exact-match response cache
+DEFAULT_CACHE_DIR = ".llm_cache"
+
+# Embedding model and minimum cosine similarity for semantic cache hits
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+SIMILARITY_THRESHOLD = 0.92
+
+_encoder: Optional[Any] = None
+
+def _get_encoder() -> Any:
+    """Return the process-wide sentence encoder, loading it on first use."""
+    global _encoder
+    if _encoder is None:
+        _encoder = SentenceTransformer(EMBEDDING_MODEL)
+    return _encoder
+
+class CachingLLM:
+    """Proxy around an LLM that serves repeated prompts from a two-tier response cache."""
+    
+    def __init__(self, llm: Any, cache_dir: str = DEFAULT_CACHE_DIR, semantic: bool = True,
+                 deterministic: Optional[bool] = None):
+        """
+        Wrap an LLM with an exact-match disk cache and an optional semantic cache.
+        
+        Args:
+            llm (Any): Wrapped chat model or LLM handler
+            cache_dir (str): Directory backing the exact-match cache
+            semantic (bool): Enable the embedding-similarity cache when its dependencies are installed
+            deterministic (Optional[bool]): Whether the LLM returns the same output for the same prompt.
+                If omitted, only an LLM with an explicit temperature of 0 counts as deterministic.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.llm = llm
+        self.model_name = getattr(llm, 'model_name', type(llm).__name__)
+        # Only deterministic calls may be answered from cache; an unknown temperature
+        # (e.g. llama.cpp, which samples at 0.8 by default) disables caching
+        if deterministic is None:
+            deterministic = getattr(llm, 'temperature', None) == 0
+        self.enabled = deterministic
+        self.cache = diskcache.Cache(cache_dir)
+        
+        self.encoder = None
+        self._semantic_indexes: Dict[str, Any] = {}
+        self._semantic_responses: Dict[str, List[str]] = {}
+        if semantic and self.enabled:
+            if faiss is None or SentenceTransformer is None:
+                self.logger.info("faiss/sentence-transformers not installed; semantic LLM cache disabled")
+            else:
+                self.encoder = _get_encoder()
+    
+    def __getattr__(self, name: str) -> Any:
+        """Delegate everything that is not cached to the wrapped LLM."""
+        return getattr(self.llm, name)
+    
+    def invoke(self, messages: List[BaseMessage]) -> AIMessage:
+        """
+        Cached equivalent of the wrapped chat model's invoke().
+        
+        Args:
+            messages (List[BaseMessage]): Prompt messages
+        
+        Returns:
+            AIMessage: Model response
+        """
+        cached = self._lookup(messages)
+        if cached is not None:
+            return AIMessage(content=cached)
+        
+        response = self.llm.invoke(messages)
+        self._store(messages, response.content)
+        return response
+    
+    def generate(self, all_messages: List[List[BaseMessage]]) -> LLMResult:
+        """
+        Cached equivalent of the wrapped chat model's generate().
+        
+        Only the prompts missing from the cache are forwarded, as one batch.
+        
+        Args:
+            all_messages (List[List[BaseMessage]]): One message list per prompt
+        
+        Returns:
+            LLMResult: One generation list per prompt, in input order
+        """
+        texts, misses = self._lookup_all(all_messages)
+        if misses:
+            result = self.llm.generate([all_messages[i] for i in misses])
+            self._store_all(all_messages, texts, misses, result)
+        return self._build_result(texts)
+    
+    async def ainvoke(self, messages: List[BaseMessage]) -> AIMessage:
+        """Async counterpart of invoke()."""
+        cached = self._lookup(messages)
+        if cached is not None:
+            return AIMessage(content=cached)
+        
+        response = await self.llm.ainvoke(messages)
+        self._store(messages, response.content)
+        return response
+    
+    async def agenerate(self, all_messages: List[List[BaseMessage]]) -> LLMResult:
+        """Async counterpart of generate()."""
+        texts, misses = self._lookup_all(all_messages)
+        if misses:
+            result = await self.llm.agenerate([all_messages[i] for i in misses])
+            self._store_all(all_messages, texts, misses, result)
+        return self._build_result(texts)
+    
+    def cached_call(self, method: str, *args: Any) -> Any:
+        """
+        Call a method of the wrapped LLM through the exact-match cache.
+        
+        Args:
+            method (str): Name of the wrapped method
+            *args (Any): JSON-serializable positional arguments
+        
+        Returns:
+            Any: The method's (possibly cached) return value
+        """
+        if not self.enabled:
+            return getattr(self.llm, method)(*args)
+        
+        key = self._cache_key({'method': method, 'args': args})
+        result = self.cache.get(key)
+        if result is None:
+            result = getattr(self.llm, method)(*args)
+            self.cache.set(key, result)
+        return result
+    
+    def _cache_key(self, payload: Dict[str, Any]) -> str:
+        """Build the SHA-256 cache key for a request payload."""
+        payload = {'model': self.model_name, **payload}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    def _lookup(self, messages: Sequence[BaseMessage]) -> Optional[str]:
+        """Return a cached response for the prompt, trying the exact tier first."""
+        if not self.enabled:
+            return None
+        
+        cached = self.cache.get(self._message_key(messages))
+        if cached is not None or self.encoder is None:
+            return cached
+        
+        prefix, text = self._split_prompt(messages)
+        index = self._semantic_indexes.get(prefix)
+        if index is None or index.ntotal == 0 or not self._fits_encoder(text):
+            return None
+        
+        scores, ids = index.search(self._embed(text), 1)
+        if scores[0][0] >= SIMILARITY_THRESHOLD:
+            return self._semantic_responses[prefix][ids[0][0]]
+        return None
+    
+    def _store(self, messages: Sequence[BaseMessage], response: str):
+        """Record a response in both cache tiers."""
+        if not self.enabled:
+            return
+        
+        self.cache.set(self._message_key(messages), response)
+        
+        if self.encoder is not None:
+            prefix, text = self._split_prompt(messages)
+            if not self._fits_encoder(text):
+                return
+            index = self._semantic_indexes.get(prefix)
+            if index is None:
+                index = faiss.IndexFlatIP(self.encoder.get_sentence_embedding_dimension())
+                self._semantic_indexes[prefix] = index
+                self._semantic_responses[prefix] = []
+            index.add(self._embed(text))
+            self._semantic_responses[prefix].append(response)
+    
+    def _lookup_all(self, all_messages: List[List[BaseMessage]]) -> tuple:
+        """Look up every prompt, returning the cached texts and the indices that missed."""
+        texts: List[Optional[str]] = [self._lookup(messages) for messages in all_messages]
+        misses = [i for i, text in enumerate(texts) if text is None]
+        return texts, misses
+    
+    def _store_all(self, all_messages: List[List[BaseMessage]], texts: List[Optional[str]],
+                   misses: List[int], result: LLMResult):
+        """Fill in and cache the generations returned for the missed prompts."""
+        for i, generations in zip(misses, result.generations):
+            texts[i] = generations[0].text
+            self._store(all_messages[i], texts[i])
+    
+    @staticmethod
+    def _build_result(texts: List[str]) -> LLMResult:
+        """Wrap response texts in an LLMResult with one generation per prompt."""
+        return LLMResult(generations=[
+            [ChatGeneration(message=AIMessage(content=text))] for text in texts
+        ])
+    
+    def _message_key(self, messages: Sequence[BaseMessage]) -> str:
+        """Build the exact-match cache key for a message list."""
+        return self._cache_key({'messages': [[m.type, m.content] for m in messages]})
+    
+    @staticmethod
+    def _split_prompt(messages: Sequence[BaseMessage]) -> tuple:
+        """Split a prompt into its system instructions and the user text compared semantically."""
+        system = "\n".join(m.content for m in messages if m.type == 'system')
+        user = "\n".join(m.content for m in messages if m.type != 'system')
+        return system, user
+    
+    def _fits_encoder(self, text: str) -> bool:
+        """
+        Check that the encoder sees the whole text.
+        
+        The encoder silently truncates longer inputs, so prompts that only share their
+        first max_seq_length tokens would look identical to the semantic tier.
+        """
+        return len(self.encoder.tokenizer.encode(text)) <= self.encoder.max_seq_length
+    
+    def _embed(self, text: str) -> np.ndarray:
+        """Embed text as a normalized float32 row vector for inner-product search."""
+        return self.encoder.encode([text], normalize_embeddings=True).astype(np.float32)
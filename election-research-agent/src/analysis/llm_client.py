@@ -0,0 +1,60 @@
+from typing import Any, Coroutine, Optional
+import asyncio
+import httpx
+from langchain.chat_models import ChatOpenAI
+from openai import AsyncOpenAI, OpenAI
+
+# Connection pool shared by every analyzer talking to the OpenAI-compatible endpoint
+POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+_shared_llm: Optional[ChatOpenAI] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def get_shared_llm() -> ChatOpenAI:
+    """
+    Return the process-wide chat model.
+    
+    All analyzers share one sync and one async OpenAI client, each backed by a single
+    keep-alive connection pool, instead of building their own per instance.
+    
+    Returns:
+        ChatOpenAI: Shared deterministic (temperature=0) chat model
+    """
+    global _shared_llm
+    if _shared_llm is None:
+        llm = ChatOpenAI(temperature=0)
+        
+        # Rebuild the SDK clients from ChatOpenAI's resolved settings (OPENAI_API_BASE, organization,
+        # timeout, retries, ...) so only the connection pool changes, not where requests go
+        api_key = llm.openai_api_key
+        settings = {
+            'api_key': api_key.get_secret_value() if hasattr(api_key, 'get_secret_value') else api_key,
+            'organization': llm.openai_organization,
+            'base_url': llm.openai_api_base,
+            'timeout': llm.request_timeout,
+            'max_retries': llm.max_retries,
+            'default_headers': getattr(llm, 'default_headers', None),
+            'default_query': getattr(llm, 'default_query', None)
+        }
+        llm.client = OpenAI(**settings, http_client=httpx.Client(limits=POOL_LIMITS)).chat.completions
+        llm.async_client = AsyncOpenAI(**settings, http_client=httpx.AsyncClient(limits=POOL_LIMITS)).chat.completions
+        _shared_llm = llm
+    return _shared_llm
+
+def run_async(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run a coroutine to completion on the process-wide event loop.
+    
+    The async connection pool is bound to the loop it was first used on, so every
+    async fan-out runs on the same loop rather than a fresh one per asyncio.run().
+    
+    Args:
+        coro (Coroutine[Any, Any, Any]): Coroutine to run
+    
+    Returns:
+        Any: The coroutine's result
+    """
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
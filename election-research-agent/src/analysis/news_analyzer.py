@@ -1,9 +1,36 @@
 from typing import Dict, List, Any
+import asyncio
+import hashlib
 import logging
-from langchain.chat_models import ChatOpenAI
-from langchain.schema import HumanMessage, SystemMessage
+from concurrent.futures import ThreadPoolExecutor
+import diskcache
+import requests
+from requests.adapters import HTTPAdapter
+from langchain.schema import BaseMessage, HumanMessage, SystemMessage
 from newspaper import Article
 import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from ..data.article_config import ARTICLE_CONFIG
+from .llm_cache import CachingLLM
+from .llm_client import get_shared_llm, run_async
+
+# Upper bound on concurrent article downloads
+MAX_PARSE_WORKERS = 32
+
+# Upper bounds (estimated tokens) of the length bins used to batch LLM calls
+LENGTH_BINS = (256, 1024, 4096)
+
+# Number of TF-IDF keywords kept per article
+NUM_KEYWORDS = 10
+
+# System prompts are kept byte-identical across calls so servers with prefix
+# caching (e.g. vLLM --enable-prefix-caching) can reuse their KV blocks
+ARTICLE_ANALYSIS_PROMPT = "You are an expert political analyst. Analyze this news article for election-related information."
+META_ANALYSIS_PROMPT = "You are an expert political analyst. Provide a meta-analysis of these news analyses."
+
+# Parsed article contents are cached on disk by URL for a day
+ARTICLE_CACHE_DIR = ".article_cache"
+ARTICLE_CACHE_TTL = 24 * 60 * 60
 
 class NewsAnalyzer:
     """Agent responsible for analyzing news articles and extracting relevant election information."""
@@ -11,7 +38,18 @@ class NewsAnalyzer:
     def __init__(self):
         """Initialize the news analyzer with necessary components."""
         self.logger = logging.getLogger(__name__)
-        self.llm = ChatOpenAI(temperature=0)
+        self.llm = CachingLLM(get_shared_llm())
+        # System messages are immutable, so build (and validate) them once and share them
+        self._article_system_message = SystemMessage(content=ARTICLE_ANALYSIS_PROMPT)
+        self._meta_system_message = SystemMessage(content=META_ANALYSIS_PROMPT)
+        # Shared session so article downloads reuse pooled keep-alive connections
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = ARTICLE_CONFIG.browser_user_agent
+        # Keep one pooled connection per parse worker (the default of 10 would discard the rest)
+        adapter = HTTPAdapter(pool_maxsize=MAX_PARSE_WORKERS)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.cache = diskcache.Cache(ARTICLE_CACHE_DIR)
         
     def analyze(self, news_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -24,55 +62,185 @@ class NewsAnalyzer:
             Dict[str, Any]: Analysis results including sentiment, topics, and key findings
         """
         try:
-            analyzed_articles = []
+            # Phase 1: fetch and parse every article concurrently
+            parsed_articles = []
+            if news_data:
+                with ThreadPoolExecutor(max_workers=min(MAX_PARSE_WORKERS, len(news_data))) as executor:
+                    parsed_articles = list(executor.map(self._parse_article, news_data))
+            self._extract_keywords(parsed_articles)
             
-            for article in news_data:
-                analysis = self._analyze_single_article(article)
-                analyzed_articles.append(analysis)
+            # Phase 2: analyze parsed articles in length-binned LLM batches
+            analyzed_articles = run_async(self._analyze_parsed_articles(parsed_articles))
             
             return self._aggregate_analysis(analyzed_articles)
             
         except Exception as e:
-            self.logger.error(f"Error analyzing news data: {str(e)}")
+            self.logger.error("Error analyzing news data: %s", e)
             raise
     
-    def _analyze_single_article(self, article: Dict[str, str]) -> Dict[str, Any]:
+    def _parse_article(self, article: Dict[str, str]) -> Dict[str, Any]:
         """
-        Analyze a single news article using LLM.
+        Download and parse a single news article.
         
         Args:
             article (Dict[str, str]): Article data including URL and content
             
         Returns:
-            Dict[str, Any]: Analysis of the single article
+            Dict[str, Any]: Parsed article fields, or an error entry if parsing failed
         """
+        if not article.get('url'):
+            return {'error': 'missing url', 'url': 'unknown'}
+        
         try:
-            # Parse article using newspaper3k
-            parsed_article = Article(article['url'])
-            parsed_article.download()
-            parsed_article.parse()
-            parsed_article.nlp()
-            
-            # Use LLM for detailed analysis
-            messages = [
-                SystemMessage(content="You are an expert political analyst. Analyze this news article for election-related information."),
-                HumanMessage(content=f"Title: {parsed_article.title}\n\nContent: {parsed_article.text}")
-            ]
-            
-            response = self.llm.invoke(messages)
+            # Serve recurring URLs from the content cache, skipping both download and parse
+            key = hashlib.sha256(article['url'].encode('utf-8')).hexdigest()
+            content = self.cache.get(key)
+            if content is None:
+                parsed_article = self._parse_one(article['url'])
+                content = {
+                    'title': parsed_article.title,
+                    'text': parsed_article.text,
+                    'summary': parsed_article.meta_description,
+                    'publication_date': parsed_article.publish_date,
+                }
+                self.cache.set(key, content, expire=ARTICLE_CACHE_TTL)
             
             return {
                 'url': article['url'],
-                'title': parsed_article.title,
-                'summary': parsed_article.summary,
-                'keywords': parsed_article.keywords,
-                'llm_analysis': response.content,
-                'publication_date': parsed_article.publish_date,
+                'title': content['title'],
+                'text': content['text'],
+                'summary': content['summary'],
+                'keywords': [],
+                'publication_date': content['publication_date'],
             }
             
         except Exception as e:
-            self.logger.error(f"Error analyzing article {article.get('url', 'unknown')}: {str(e)}")
-            return {'error': str(e), 'url': article.get('url', 'unknown')}
+            self.logger.error("Error analyzing article %s: %s", article['url'], e)
+            return {'error': str(e), 'url': article['url']}
+    
+    def _parse_one(self, url: str) -> Article:
+        """
+        Fetch a URL over the shared session and parse it with newspaper3k.
+        
+        Args:
+            url (str): Article URL
+            
+        Returns:
+            Article: Downloaded and parsed article
+        """
+        response = self.session.get(url, timeout=ARTICLE_CONFIG.request_timeout)
+        response.raise_for_status()
+        
+        # Hand over the raw bytes: newspaper3k detects the charset from the page's meta tags,
+        # while response.text would assume ISO-8859-1 for text/html served without one
+        parsed_article = Article(url, config=ARTICLE_CONFIG)
+        parsed_article.download(input_html=response.content)
+        parsed_article.parse()
+        return parsed_article
+    
+    def _extract_keywords(self, parsed_articles: List[Dict[str, Any]]):
+        """
+        Extract the top TF-IDF keywords of each parsed article in one vectorized pass.
+        
+        Args:
+            parsed_articles (List[Dict[str, Any]]): Output of _parse_article, updated in place
+        """
+        pending = [a for a in parsed_articles if 'error' not in a and a['text'].strip()]
+        if not pending:
+            return
+        
+        # max_df would prune every term of a single-document corpus
+        vectorizer = TfidfVectorizer(
+            max_df=0.9 if len(pending) > 1 else 1.0,
+            stop_words='english',
+            ngram_range=(1, 2)
+        )
+        try:
+            tfidf = vectorizer.fit_transform([a['text'] for a in pending])
+        except ValueError as e:
+            # Raised when the texts contain nothing but stop words
+            self.logger.warning("Could not extract keywords: %s", e)
+            return
+        
+        feature_names = vectorizer.get_feature_names_out()
+        for article, row in zip(pending, tfidf):
+            k = min(NUM_KEYWORDS, row.nnz)
+            if k == 0:
+                continue
+            top = np.argpartition(-row.data, k - 1)[:k]
+            top = top[np.argsort(-row.data[top])]
+            article['keywords'] = feature_names[row.indices[top]].tolist()
+    
+    async def _analyze_parsed_articles(self, parsed_articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Analyze parsed articles with one batched LLM call per length bin.
+        
+        Args:
+            parsed_articles (List[Dict[str, Any]]): Output of _parse_article for each article
+            
+        Returns:
+            List[Dict[str, Any]]: Analysis of each article, in the original order
+        """
+        pending = [a for a in parsed_articles if 'error' not in a]
+        if not pending:
+            return parsed_articles
+        
+        # Group articles into length bins so each batch holds similarly sized prompts
+        bins: Dict[int, List[Dict[str, Any]]] = {}
+        for a in pending:
+            bins.setdefault(self._length_bin(a['text']), []).append(a)
+        
+        # Issue every bin concurrently over the shared async client
+        await asyncio.gather(*[self._analyze_bin(bin_articles) for bin_articles in bins.values()])
+        
+        return [
+            {'error': a['error'], 'url': a['url']} if 'error' in a else a
+            for a in parsed_articles
+        ]
+    
+    async def _analyze_bin(self, bin_articles: List[Dict[str, Any]]):
+        """
+        Analyze one length bin of parsed articles in a single batched LLM call.
+        
+        Args:
+            bin_articles (List[Dict[str, Any]]): Parsed articles of similar length, updated in place
+        """
+        # Use LLM for detailed analysis
+        all_messages: List[List[BaseMessage]] = [
+            [
+                self._article_system_message,
+                HumanMessage.construct(content=f"Title: {a['title']}\n\nContent: {a.pop('text')}")
+            ]
+            for a in bin_articles
+        ]
+        
+        try:
+            result = await self.llm.agenerate(all_messages)
+        except Exception as e:
+            self.logger.error("Error running batched article analysis: %s", e)
+            for a in bin_articles:
+                a['error'] = str(e)
+            return
+        
+        for article, generations in zip(bin_articles, result.generations):
+            article['llm_analysis'] = generations[0].text
+    
+    @staticmethod
+    def _length_bin(text: str) -> int:
+        """
+        Map article text to the index of its estimated token-length bin.
+        
+        Args:
+            text (str): Article body
+            
+        Returns:
+            int: Index into LENGTH_BINS, or len(LENGTH_BINS) for the overflow bin
+        """
+        estimated_tokens = len(text.split())
+        for i, upper in enumerate(LENGTH_BINS):
+            if estimated_tokens < upper:
+                return i
+        return len(LENGTH_BINS)
     
     def _aggregate_analysis(self, analyzed_articles: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -89,8 +257,8 @@ class NewsAnalyzer:
             combined_analysis = "\n\n".join([a['llm_analysis'] for a in analyzed_articles if 'llm_analysis' in a])
             
             messages = [
-                SystemMessage(content="You are an expert political analyst. Provide a meta-analysis of these news analyses."),
-                HumanMessage(content=combined_analysis)
+                self._meta_system_message,
+                HumanMessage.construct(content=combined_analysis)
             ]
             
             meta_analysis = self.llm.invoke(messages)
@@ -102,5 +270,5 @@ class NewsAnalyzer:
             }
             
         except Exception as e:
-            self.logger.error(f"Error in aggregating analysis: {str(e)}")
+            self.logger.error("Error in aggregating analysis: %s", e)
             raise
\ No newline at end of file
@@ -1,10 +1,14 @@
 from typing import Dict, List, Any
 import logging
 import tweepy
-from langchain.chat_models import ChatOpenAI
 from langchain.schema import HumanMessage, SystemMessage
 import numpy as np
-from datetime import datetime, timedelta
+from .llm_cache import CachingLLM
+from .llm_client import get_shared_llm, run_async
+from datetime import datetime, timedelta, timezone
+
+# Kept byte-identical across calls so servers with prefix caching can reuse its KV blocks
+TWITTER_ANALYSIS_PROMPT = "You are an expert in social media analysis and political sentiment. Analyze these tweets for election-related patterns and sentiment."
 
 class SocialMediaAnalyzer:
     """Agent responsible for analyzing social media content related to elections."""
@@ -12,7 +16,9 @@ class SocialMediaAnalyzer:
     def __init__(self):
         """Initialize the social media analyzer with necessary components."""
         self.logger = logging.getLogger(__name__)
-        self.llm = ChatOpenAI(temperature=0)
+        self.llm = CachingLLM(get_shared_llm())
+        # System message is immutable, so build (and validate) it once and share it
+        self._twitter_system_message = SystemMessage(content=TWITTER_ANALYSIS_PROMPT)
         self._setup_twitter_client()
         
     def _setup_twitter_client(self):
@@ -28,7 +34,7 @@ class SocialMediaAnalyzer:
             )
             self.twitter_client = tweepy.API(auth)
         except Exception as e:
-            self.logger.error(f"Error setting up Twitter client: {str(e)}")
+            self.logger.error("Error setting up Twitter client: %s", e)
             raise
     
     def analyze(self, social_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -42,7 +48,7 @@ class SocialMediaAnalyzer:
             Dict[str, Any]: Analysis results including sentiment and trends
         """
         try:
-            twitter_analysis = self._analyze_twitter(social_data.get('twitter', []))
+            twitter_analysis = run_async(self._analyze_twitter(social_data.get('twitter', [])))
             # Add other platforms as needed (Facebook, Instagram, etc.)
             
             return {
@@ -51,10 +57,10 @@ class SocialMediaAnalyzer:
                 'overall_sentiment': self._calculate_overall_sentiment(twitter_analysis)
             }
         except Exception as e:
-            self.logger.error(f"Error in social media analysis: {str(e)}")
+            self.logger.error("Error in social media analysis: %s", e)
             raise
     
-    def _analyze_twitter(self, tweets: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def _analyze_twitter(self, tweets: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Analyze Twitter data using LLM.
         
@@ -65,27 +71,37 @@ class SocialMediaAnalyzer:
             Dict[str, Any]: Analysis of Twitter content
         """
         try:
+            # Drop duplicate tweets (same id) so they are neither re-sent to the LLM nor re-counted
+            unique_tweets = list({tweet['id']: tweet for tweet in tweets}.values())
+            
             # Prepare tweets for analysis
-            tweet_texts = "\n\n".join([tweet['text'] for tweet in tweets])
+            tweet_texts = "\n\n".join(tweet['text'] for tweet in unique_tweets)
             
             messages = [
-                SystemMessage(content="You are an expert in social media analysis and political sentiment. Analyze these tweets for election-related patterns and sentiment."),
-                HumanMessage(content=f"Tweets:\n{tweet_texts}")
+                self._twitter_system_message,
+                HumanMessage.construct(content=f"Tweets:\n{tweet_texts}")
             ]
             
-            analysis = self.llm.invoke(messages)
+            analysis = await self.llm.ainvoke(messages)
+            
+            # Single vectorized pass for the earliest and latest tweet
+            timestamps = np.fromiter(
+                (tweet['created_at'] for tweet in unique_tweets),
+                dtype=np.float64,
+                count=len(unique_tweets)
+            )
             
             return {
                 'sentiment_analysis': analysis.content,
-                'tweet_count': len(tweets),
+                'tweet_count': len(unique_tweets),
                 'time_period': {
-                    'start': min(tweet['created_at'] for tweet in tweets),
-                    'end': max(tweet['created_at'] for tweet in tweets)
+                    'start': datetime.fromtimestamp(timestamps.min(), tz=timezone.utc),
+                    'end': datetime.fromtimestamp(timestamps.max(), tz=timezone.utc)
                 }
             }
             
         except Exception as e:
-            self.logger.error(f"Error analyzing Twitter data: {str(e)}")
+            self.logger.error("Error analyzing Twitter data: %s", e)
             raise
     
     def _calculate_overall_sentiment(self, twitter_analysis: Dict[str, Any]) -> float:
@@ -104,5 +120,5 @@ class SocialMediaAnalyzer:
             return 0.0
             
         except Exception as e:
-            self.logger.error(f"Error calculating overall sentiment: {str(e)}")
+            self.logger.error("Error calculating overall sentiment: %s", e)
             raise
\ No newline at end of file
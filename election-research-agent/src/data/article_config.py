@@ -0,0 +1,7 @@
+from newspaper import Config
+
+# newspaper3k config shared by every article fetch/parse: skip image fetching and bound request time
+ARTICLE_CONFIG = Config()
+ARTICLE_CONFIG.fetch_images = False
+ARTICLE_CONFIG.browser_user_agent = "Mozilla/5.0"
+ARTICLE_CONFIG.request_timeout = 10
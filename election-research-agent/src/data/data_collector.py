@@ -1,11 +1,59 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+import asyncio
 import logging
-import requests
+import aiohttp
+import httpx
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+from functools import lru_cache
 from datetime import datetime, timedelta
 import tweepy
 from newspaper import Article, ArticleException
 import os
 from dotenv import load_dotenv
+from .article_config import ARTICLE_CONFIG
+
+# Upper bound on concurrent article downloads
+MAX_CONCURRENT_FETCHES = 32
+
+# Limit to 1000 tweets for MVP
+MAX_TWEETS = 1000
+
+def _is_retryable(error: BaseException) -> bool:
+    """Retry on network errors and server-side (5xx) or rate-limit (429) responses."""
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return False
+
+@lru_cache(maxsize=128)
+def _build_news_query(election_type: Optional[str], country: Optional[str], region: Optional[str],
+                      candidates: Tuple[str, ...], keywords: Tuple[str, ...]) -> str:
+    """
+    Build the News API search query from election parameters.
+    
+    Args:
+        election_type (Optional[str]): Type of election
+        country (Optional[str]): Country where the election is held
+        region (Optional[str]): Specific region/state if applicable
+        candidates (Tuple[str, ...]): Candidate names, matched as exact phrases
+        keywords (Tuple[str, ...]): Additional keywords
+    
+    Returns:
+        str: Search query joining all terms with AND
+    """
+    # Add election type and location
+    search_terms = [term for term in (election_type, country, region) if term]
+    
+    # Add candidates
+    search_terms.extend(f'"{c}"' for c in candidates)
+    
+    # Add keywords
+    search_terms.extend(keywords)
+    
+    # Combine into search query
+    return ' AND '.join(search_terms)
 
 class DataCollector:
     """Agent responsible for collecting data from various sources."""
@@ -33,8 +81,16 @@ class DataCollector:
             # News API setup
             self.news_api_key = os.getenv('NEWS_API_KEY')
             
+            # Pooled HTTP/2 client so repeated collections reuse one multiplexed connection
+            self.http = httpx.Client(
+                http2=True,
+                timeout=httpx.Timeout(10.0, connect=3.0),
+                limits=httpx.Limits(max_connections=100),
+                headers={'Accept-Encoding': 'br, gzip'}
+            )
+            
         except Exception as e:
-            self.logger.error(f"Error setting up APIs: {str(e)}")
+            self.logger.error("Error setting up APIs: %s", e)
             raise
     
     def collect(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -66,7 +122,7 @@ class DataCollector:
             }
             
         except Exception as e:
-            self.logger.error(f"Error collecting data: {str(e)}")
+            self.logger.error("Error collecting data: %s", e)
             raise
     
     def _collect_news(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -80,27 +136,14 @@ class DataCollector:
             List[Dict[str, Any]]: Collection of news articles
         """
         try:
-            # Build search query from parameters
-            search_terms = []
-            
-            # Add election type and location
-            if params.get('election_type'):
-                search_terms.append(params['election_type'])
-            if params.get('country'):
-                search_terms.append(params['country'])
-            if params.get('region'):
-                search_terms.append(params['region'])
-            
-            # Add candidates
-            candidates = params.get('candidates', [])
-            if candidates:
-                search_terms.extend([f'"{c}"' for c in candidates])
-            
-            # Add keywords
-            search_terms.extend(params.get('keywords', []))
-            
-            # Combine into search query
-            query = ' AND '.join(search_terms)
+            # Build search query from parameters (cached across repeated collections)
+            query = _build_news_query(
+                params.get('election_type'),
+                params.get('country'),
+                params.get('region'),
+                tuple(params.get('candidates') or ()),
+                tuple(params.get('keywords') or ())
+            )
             
             # Use News API to get election-related articles
             base_url = "https://newsapi.org/v2/everything"
@@ -112,36 +155,114 @@ class DataCollector:
                 'apiKey': self.news_api_key
             }
             
-            response = requests.get(base_url, params=params)
-            response.raise_for_status()
-            articles = response.json().get('articles', [])
+            articles = self._fetch_news_api(base_url, api_params).get('articles', [])
             
-            # Process and clean articles
-            processed_articles = []
-            for article in articles:
-                try:
-                    # Use newspaper3k to extract clean text
-                    article_obj = Article(article['url'])
-                    article_obj.download()
-                    article_obj.parse()
-                    
-                    processed_articles.append({
-                        'url': article['url'],
-                        'title': article['title'],
-                        'text': article_obj.text,
-                        'published_at': article['publishedAt'],
-                        'source': article['source']['name']
-                    })
-                except ArticleException as ae:
-                    self.logger.warning(f"Error processing article {article['url']}: {str(ae)}")
-                    continue
-                
-            return processed_articles
+            # Fetch, process and clean articles concurrently
+            return asyncio.run(self._process_articles(articles))
             
         except Exception as e:
-            self.logger.error(f"Error collecting news data: {str(e)}")
+            self.logger.error("Error collecting news data: %s", e)
             raise
     
+    @retry(
+        retry=retry_if_exception(_is_retryable),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=0.3),
+        reraise=True
+    )
+    def _fetch_news_api(self, url: str, api_params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Query News API, retrying transient failures with exponential backoff.
+        
+        Args:
+            url (str): News API endpoint
+            api_params (Dict[str, Any]): Query parameters
+            
+        Returns:
+            Dict[str, Any]: Decoded JSON response
+        """
+        response = self.http.get(url, params=api_params)
+        response.raise_for_status()
+        return response.json()
+    
+    async def _process_articles(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Fetch and parse News API articles concurrently on one event loop.
+        
+        Args:
+            articles (List[Dict[str, Any]]): Article entries returned by News API
+            
+        Returns:
+            List[Dict[str, Any]]: Processed articles, skipping any that could not be fetched or parsed
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+        connector = aiohttp.TCPConnector(limit=100, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=ARTICLE_CONFIG.request_timeout)
+        headers = {'User-Agent': ARTICLE_CONFIG.browser_user_agent}
+        
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+            # Collect failures per article so one bad page cannot sink the whole batch
+            results = await asyncio.gather(*[
+                self._process_article(session, semaphore, article)
+                for article in articles
+                if article.get('url')
+            ], return_exceptions=True)
+        
+        processed = []
+        for result in results:
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result
+                self.logger.warning("Error processing article: %s", result)
+            elif result is not None:
+                processed.append(result)
+        return processed
+    
+    async def _process_article(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                               article: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Extract clean text for a single News API article.
+        
+        Args:
+            session (aiohttp.ClientSession): Shared HTTP session
+            semaphore (asyncio.Semaphore): Bounds the number of in-flight fetches
+            article (Dict[str, Any]): Article entry returned by News API
+            
+        Returns:
+            Optional[Dict[str, Any]]: Processed article, or None if it could not be parsed
+        """
+        try:
+            async with semaphore:
+                async with session.get(article['url']) as response:
+                    response.raise_for_status()
+                    body = await response.read()
+                    charset = response.charset
+            
+            # With an explicit, known charset decode leniently; otherwise hand newspaper3k the raw
+            # bytes so it can detect the encoding from the page's <meta charset>
+            html = body
+            if charset:
+                try:
+                    html = body.decode(charset, errors='replace')
+                except LookupError:
+                    pass
+            
+            # Use newspaper3k to extract clean text from the already fetched HTML
+            article_obj = Article(article['url'], config=ARTICLE_CONFIG)
+            article_obj.set_html(html)
+            article_obj.parse()
+            
+            return {
+                'url': article['url'],
+                'title': article['title'],
+                'text': article_obj.text,
+                'published_at': article['publishedAt'],
+                'source': article['source']['name']
+            }
+        except (ArticleException, aiohttp.ClientError, asyncio.TimeoutError, UnicodeDecodeError, LookupError) as ae:
+            self.logger.warning("Error processing article %s: %s", article['url'], ae)
+            return None
+    
     def _collect_social_media(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
         Collect social media data from various platforms based on parameters.
@@ -164,7 +285,7 @@ class DataCollector:
             }
             
         except Exception as e:
-            self.logger.error(f"Error collecting social media data: {str(e)}")
+            self.logger.error("Error collecting social media data: %s", e)
             raise
     
     def _collect_twitter(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -201,44 +322,31 @@ class DataCollector:
             
             # Combine into search query
             query = ' '.join(search_terms) + ' -filter:retweets'
-            tweets = []
             
-            # Collect tweets from the past week
+            # Collect tweets from the past week into a pre-sized list
+            tweets: List[Optional[Dict[str, Any]]] = [None] * MAX_TWEETS
+            count = 0
             for tweet in tweepy.Cursor(
                 self.twitter_client.search_tweets,
                 q=query,
                 tweet_mode="extended",
-                lang="en"
-            ).items(1000):  # Limit to 1000 tweets for MVP
-                tweets.append({
-                    'id': tweet.id,
-                    'text': tweet.full_text,
-                    'created_at': tweet.created_at,
-                    'user': tweet.user.screen_name,
-                    'retweet_count': tweet.retweet_count,
-                    'favorite_count': tweet.favorite_count
-                })
-            
-            return tweets
-            
-            # Collect tweets from the past week
-            for tweet in tweepy.Cursor(
-                self.twitter_client.search_tweets,
-                q=search_query,
-                tweet_mode="extended",
-                lang="en"
-            ).items(1000):  # Limit to 1000 tweets for MVP
-                tweets.append({
+                lang="en",
+                count=100  # Maximum page size, so 1000 tweets take 10 requests instead of ~67
+            ).items(MAX_TWEETS):
+                user = tweet.user
+                tweets[count] = {
                     'id': tweet.id,
                     'text': tweet.full_text,
-                    'created_at': tweet.created_at,
-                    'user': tweet.user.screen_name,
+                    'created_at': tweet.created_at.timestamp(),  # POSIX seconds, cheap to reduce in bulk
+                    'user': user.screen_name,
                     'retweet_count': tweet.retweet_count,
                     'favorite_count': tweet.favorite_count
-                })
+                }
+                count += 1
             
+            del tweets[count:]
             return tweets
             
         except Exception as e:
-            self.logger.error(f"Error collecting Twitter data: {str(e)}")
+            self.logger.error("Error collecting Twitter data: %s", e)
             raise
\ No newline at end of file
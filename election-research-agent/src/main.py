@@ -1,30 +1,62 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 from datetime import datetime
+import asyncio
+import io
 import json
 import logging
+import os
 from .analysis.news_analyzer import NewsAnalyzer
 from .analysis.social_media_analyzer import SocialMediaAnalyzer
 from .data.data_collector import DataCollector
 from .models.prediction_model import PredictionModel
 from .models.local_llm import LocalLLMHandler
 from .reports.report_generator import ReportGenerator
+from .analysis.llm_cache import CachingLLM
+from .analysis.llm_client import run_async
+
+try:
+    import uvloop
+except ImportError:  # Not available on Windows; fall back to the default event loop
+    uvloop = None
+
+# Use libuv's event loop for every async fan-out (must happen before any loop is created)
+if uvloop is not None:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+# Default cap on the text sent to the LLM per analysis. Llama-2-7B-chat has a 4096-token
+# context, which must also hold the prompt template and the generated analysis
+DEFAULT_MAX_INPUT_TOKENS = 3000
+CHARS_PER_TOKEN = 4
 
 class ElectionResearchSystem:
     """Main class orchestrating the election research agent system."""
     
-    def __init__(self):
-        """Initialize the election research system with its component agents."""
+    def __init__(self, max_input_tokens: Optional[int] = None):
+        """
+        Initialize the election research system with its component agents.
+        
+        Args:
+            max_input_tokens (Optional[int]): Cap on the article or tweet text sent to the LLM per
+                analysis. Defaults to the MAX_INPUT_TOKENS environment variable, or DEFAULT_MAX_INPUT_TOKENS.
+                Keep it below the model's context size minus the prompt and output budget.
+        """
         self.data_collector = DataCollector()
         self.news_analyzer = NewsAnalyzer()
         self.social_media_analyzer = SocialMediaAnalyzer()
         self.prediction_model = PredictionModel()
         self.report_generator = ReportGenerator()
         
+        # DataCollector() has loaded .env by now, so the override can live there too
+        if max_input_tokens is None:
+            max_input_tokens = int(os.getenv('MAX_INPUT_TOKENS', DEFAULT_MAX_INPUT_TOKENS))
+        self.max_input_chars = max_input_tokens * CHARS_PER_TOKEN
+        
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
         
-        # Initialize local LLM handler
-        self.llm_handler = LocalLLMHandler()
+        # Initialize local LLM handler behind the response cache. cached_call() only uses the
+        # exact-match tier, and caching stays off unless the handler is known to be deterministic
+        self.llm_handler = CachingLLM(LocalLLMHandler(), semantic=False)
     
     def parse_election_query(self, query: str) -> Dict[str, Any]:
         """
@@ -64,26 +96,20 @@ class ElectionResearchSystem:
             self.logger.info("Starting data collection...")
             raw_data = self.data_collector.collect(election_params)
             
-            # Analyze news content using local LLM
-            self.logger.info("Analyzing news content...")
+            # Analyze news and social media content using local LLM. The two analyses are
+            # independent, so they are issued together and a batching server can pack them
+            self.logger.info("Analyzing news and social media content...")
             news_data = raw_data['news']
+            social_data = raw_data['social']['twitter']
+            news_result, social_result = run_async(self._analyze_sources(news_data, social_data))
+            
             news_analysis = {
                 'articles': news_data,
-                'analysis': self.llm_handler.analyze_content(
-                    '\n'.join(article['text'] for article in news_data),
-                    'news article'
-                )
+                'analysis': news_result
             }
-            
-            # Analyze social media using local LLM
-            self.logger.info("Analyzing social media content...")
-            social_data = raw_data['social']['twitter']
             social_analysis = {
                 'tweets': social_data,
-                'analysis': self.llm_handler.analyze_content(
-                    '\n'.join(tweet['text'] for tweet in social_data),
-                    'social media'
-                )
+                'analysis': social_result
             }
             
             # Generate predictions using local LLM
@@ -105,6 +131,58 @@ class ElectionResearchSystem:
             self.logger.error(f"Error in analysis pipeline: {str(e)}")
             raise
     
+    async def _analyze_sources(self, news_data: List[Dict[str, Any]],
+                               social_data: List[Dict[str, Any]]) -> Tuple[Any, Any]:
+        """
+        Run the news and social media content analyses, concurrently if the backend allows it.
+        
+        Args:
+            news_data (List[Dict[str, Any]]): Collected news articles
+            social_data (List[Dict[str, Any]]): Collected tweets
+            
+        Returns:
+            Tuple[Any, Any]: News analysis and social media analysis
+        """
+        calls = [
+            ('analyze_content', self._join_texts(article['text'] for article in news_data), 'news article'),
+            ('analyze_content', self._join_texts(tweet['text'] for tweet in social_data), 'social media')
+        ]
+        
+        # A llama.cpp model shares one context and KV cache, so calls must not overlap unless
+        # the handler declares itself safe for concurrent use (e.g. an OpenAI-compatible client)
+        if not getattr(self.llm_handler, 'supports_concurrent_calls', False):
+            return tuple([await asyncio.to_thread(self.llm_handler.cached_call, *call) for call in calls])
+        
+        return tuple(await asyncio.gather(*[
+            asyncio.to_thread(self.llm_handler.cached_call, *call) for call in calls
+        ]))
+    
+    def _join_texts(self, texts: Iterable[str]) -> str:
+        """
+        Join texts with newlines, stopping once the LLM input budget is used up.
+        
+        Args:
+            texts (Iterable[str]): Article or tweet texts, in priority order
+            
+        Returns:
+            str: Newline-joined text of at most max_input_chars characters
+        """
+        buffer = io.StringIO()
+        remaining = self.max_input_chars
+        
+        for i, text in enumerate(texts):
+            if i:
+                if remaining <= 1:
+                    break
+                buffer.write('\n')
+                remaining -= 1
+            
+            remaining -= buffer.write(text[:remaining])
+            if remaining <= 0:
+                break
+        
+        return buffer.getvalue()
+    
     def generate_report(self, analysis_results: Dict[str, Any]) -> str:
         """
         Generate a comprehensive report from the analysis results.
@@ -1,172 +1,430 @@
-from typing import Dict, Any
+from typing import Dict, List, Any, Optional, Set, Tuple
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 import logging
 from datetime import datetime
+import hashlib
 import json
 import os
 from pathlib import Path
+import types
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # Optional faster serializer
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # Optional binary raw-data sidecar
+    msgspec = None
+
+# Buffer/chunk size for writing report files
+WRITE_CHUNK_SIZE = 1 << 20
+
+# Number of rendered reports kept by the content cache
+CONTENT_CACHE_SIZE = 32
+
+# Shared read-only default for missing sections, so lookups never allocate an empty dict
+_EMPTY_DICT = types.MappingProxyType({})
+
+# Default output directory for reports and their raw-data sidecars
+_REPORT_DIR = Path("reports")
+
+# Per-directory index of already written raw-data sidecars ("<digest> <filename> <size> <mtime_ns> <inode>" per line)
+RAW_INDEX_NAME = ".raw_index"
+
+# Format of the "Generated on" header timestamp
+_HUMAN_FMT = "%Y-%m-%d %H:%M:%S"
+
+# Bodies of sections with no input data, used instead of formatting all-default values
+_NO_NEWS_SECTION = "### Overview\n_No news data available._"
+_NO_SOCIAL_SECTION = "### Twitter Analysis\n_No social media data available._"
+_NO_PREDICTIONS_SECTION = "### Predicted Outcomes\n_No predictions available._"
+
+# Whole-report layout, resolved with a single format_map() call per report
+_TEMPLATE = (
+    "# Election Analysis Report\n\n"
+    "Generated on: {timestamp}\n\n"
+    "## Executive Summary\n\n{summary}\n\n"
+    "## News Analysis\n\n{news}\n\n"
+    "## Social Media Analysis\n\n{social}\n\n"
+    "## Predictions\n\n{predictions}\n\n"
+    "## Methodology\n\n{methodology}"
+)
+
+_METHODOLOGY = """Our analysis combines multiple data sources and advanced AI techniques:
+
+1. **Data Collection**
+   - News articles from major publications
+   - Social media posts and engagement metrics
+   
+2. **Analysis Techniques**
+   - Natural Language Processing for content analysis
+   - Sentiment Analysis
+   - Topic Modeling
+   
+3. **Prediction Model**
+   - Machine Learning-based prediction
+   - Confidence scoring based on data quality and coverage"""
 
 class ReportGenerator:
     """Agent responsible for generating comprehensive election analysis reports."""
     
-    def __init__(self):
-        """Initialize the report generator."""
+    # Report directories already created by this process
+    _dirs_ready: Set[Path] = set()
+    
+    def __init__(self, pretty: bool = False, report_dir: Optional[Path] = None, json_sidecar: bool = False):
+        """
+        Initialize the report generator.
+        
+        Args:
+            pretty (bool): Indent the raw-data JSON for manual inspection/debugging.
+                Off by default, since compact output is much faster to write. Implies json_sidecar.
+            report_dir (Optional[Path]): Output directory (defaults to ./reports)
+            json_sidecar (bool): Always write the raw data as JSON. By default it is written as
+                MessagePack when msgspec is installed, and as JSON otherwise.
+        """
         self.logger = logging.getLogger(__name__)
-        self.report_dir = Path("reports")
-        self.report_dir.mkdir(exist_ok=True)
+        self.pretty = pretty
+        self.json_sidecar = json_sidecar
+        self.sidecar_format = 'json' if pretty or json_sidecar or msgspec is None else 'msgpack'
+        # Bounded LRU of rendered report sections, keyed by a hash of the analysis results
+        self._content_cache: OrderedDict = OrderedDict()
+        # Raw-data sidecars already on disk, by content digest (loaded lazily from RAW_INDEX_NAME)
+        self._raw_index: Optional[Dict[str, Tuple[str, int, int, int]]] = None
+        self.report_dir = _REPORT_DIR if report_dir is None else Path(report_dir)
+        
+        # Create each directory once per process rather than once per instance
+        if self.report_dir not in self._dirs_ready:
+            self.report_dir.mkdir(parents=True, exist_ok=True)
+            self._dirs_ready.add(self.report_dir)
     
-    def generate(self, analysis_results: Dict[str, Any]) -> str:
+    def generate(self, analysis_results: Dict[str, Any], batch_index: Optional[int] = None) -> str:
         """
         Generate a comprehensive report from the analysis results.
         
         Args:
             analysis_results (Dict[str, Any]): Results from the analysis pipeline
+            batch_index (Optional[int]): Position within a generate_many() batch, appended to
+                the file names so reports written in the same second do not overwrite each other
             
         Returns:
             str: Path to the generated report file
         """
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # One clock read for both the file names and the report header
+            now = datetime.now()
+            # YYYYmmdd_HHMMSS from the integer fields, without parsing a strftime format
+            timestamp = f"{now.year:04d}{now.month:02d}{now.day:02d}_{now.hour:02d}{now.minute:02d}{now.second:02d}"
+            if batch_index is not None:
+                timestamp = f"{timestamp}_{batch_index:04d}"
             report_path = self.report_dir / f"election_analysis_{timestamp}.md"
             
-            report_content = self._create_report_content(analysis_results)
+            # One content hash keys both the section cache and the raw-data index
+            key = self._content_key(analysis_results)
+            report_content = self._create_report_content(analysis_results, now=now, key=key)
             
-            # Save the report
-            report_path.write_text(report_content)
+            # Save the report: encode once and write the bytes, bypassing the text IO stack
+            with report_path.open('wb', buffering=WRITE_CHUNK_SIZE) as f:
+                f.write(report_content.encode('utf-8'))
             
             # Save raw data for reference
-            raw_data_path = self.report_dir / f"raw_data_{timestamp}.json"
-            raw_data_path.write_text(json.dumps(analysis_results, indent=2))
+            raw_data_path = self.report_dir / f"raw_data_{timestamp}.{self.sidecar_format}"
+            self._save_raw_data(raw_data_path, analysis_results, key)
             
             return str(report_path)
             
         except Exception as e:
-            self.logger.error(f"Error generating report: {str(e)}")
+            self.logger.error("Error generating report: %s", e)
             raise
     
-    def _create_report_content(self, analysis_results: Dict[str, Any]) -> str:
+    def generate_many(self, results_list: List[Dict[str, Any]]) -> List[str]:
+        """
+        Generate one report per analysis result, spreading the work over all CPU cores.
+        
+        Each report is rendered and written by a separate worker process, so large
+        nightly batches scale with the number of cores instead of running serially.
+        
+        Args:
+            results_list (List[Dict[str, Any]]): Results from the analysis pipeline, one per report
+            
+        Returns:
+            List[str]: Paths to the generated report files, in input order
+        """
+        if len(results_list) < 2:
+            return [self.generate(results, batch_index=i) for i, results in enumerate(results_list)]
+        
+        jobs = [
+            (self.pretty, self.json_sidecar, self.report_dir, results, i)
+            for i, results in enumerate(results_list)
+        ]
+        with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(jobs))) as executor:
+            return list(executor.map(_generate_one, jobs))
+    
+    def _save_raw_data(self, raw_data_path: Path, analysis_results: Dict[str, Any], key: Optional[bytes]):
+        """
+        Save the raw-data sidecar, hard-linking an identical earlier one instead of rewriting it.
+        
+        Args:
+            raw_data_path (Path): Destination file
+            analysis_results (Dict[str, Any]): Results from the analysis pipeline
+            key (Optional[bytes]): Content hash from _content_key(), or None to always write
+        """
+        if key is None:
+            self._write_raw_data(raw_data_path, analysis_results)
+            return
+        
+        # The sidecar format and indent setting change the bytes on disk, so they are part of the index key
+        if self.sidecar_format == 'msgpack':
+            digest = key.hex() + '-msgpack'
+        else:
+            digest = key.hex() + ('-pretty' if self.pretty else '')
+        index = self._load_raw_index()
+        existing = index.get(digest)
+        
+        if existing is not None:
+            name, size, mtime_ns, inode = existing
+            source = self.report_dir / name
+            try:
+                # Only reuse the file if it is still exactly the one that was indexed
+                st = source.stat()
+                if (st.st_size, st.st_mtime_ns, st.st_ino) == (size, mtime_ns, inode):
+                    if raw_data_path.exists() and os.path.samefile(source, raw_data_path):
+                        return
+                    os.link(source, raw_data_path)
+                    return
+            except OSError:
+                # Source deleted, target taken or no hard-link support: write it out instead
+                pass
+        
+        # The file about to be replaced no longer holds what the index says it does
+        for stale in [d for d, entry in index.items() if entry[0] == raw_data_path.name]:
+            del index[stale]
+        
+        # Never truncate through a hard link shared with an older sidecar
+        raw_data_path.unlink(missing_ok=True)
+        self._write_raw_data(raw_data_path, analysis_results)
+        
+        st = raw_data_path.stat()
+        index[digest] = (raw_data_path.name, st.st_size, st.st_mtime_ns, st.st_ino)
+        with (self.report_dir / RAW_INDEX_NAME).open('a', encoding='utf-8') as f:
+            f.write(f"{digest} {raw_data_path.name} {st.st_size} {st.st_mtime_ns} {st.st_ino}\n")
+    
+    def _load_raw_index(self) -> Dict[str, Tuple[str, int, int, int]]:
+        """
+        Load the index of raw-data sidecars in the report directory.
+        
+        Returns:
+            Dict[str, Tuple[str, int, int, int]]: File name, size, mtime (ns) and inode of the
+                sidecar written for each content digest; later entries win
+        """
+        if self._raw_index is None:
+            self._raw_index = {}
+            try:
+                with (self.report_dir / RAW_INDEX_NAME).open(encoding='utf-8') as f:
+                    for line in f:
+                        fields = line.split()
+                        if len(fields) == 5 and all(field.isdigit() for field in fields[2:]):
+                            digest, name, size, mtime_ns, inode = fields
+                            self._raw_index[digest] = (name, int(size), int(mtime_ns), int(inode))
+            except FileNotFoundError:
+                pass
+        return self._raw_index
+    
+    def _write_raw_data(self, raw_data_path: Path, analysis_results: Dict[str, Any]):
+        """
+        Serialize the analysis results and write the encoded bytes straight to disk.
+        
+        Args:
+            raw_data_path (Path): Destination file
+            analysis_results (Dict[str, Any]): Results from the analysis pipeline
+        """
+        if self.sidecar_format == 'msgpack':
+            _write_bytes(raw_data_path, msgspec.msgpack.encode(analysis_results, enc_hook=_encode_numpy))
+            return
+        
+        if orjson is not None:
+            option = orjson.OPT_SERIALIZE_NUMPY
+            if self.pretty:
+                option |= orjson.OPT_INDENT_2
+            _write_bytes(raw_data_path, orjson.dumps(analysis_results, option=option))
+            return
+        
+        # json.dumps() of compact output runs the C encoder in one shot; json.dump() would
+        # stream through the much slower pure-Python iterencode
+        if self.pretty:
+            data = json.dumps(analysis_results, indent=2, ensure_ascii=False)
+        else:
+            data = json.dumps(analysis_results, separators=(',', ':'), ensure_ascii=False)
+        _write_bytes(raw_data_path, data.encode('utf-8'))
+    
+    def _create_report_content(self, analysis_results: Dict[str, Any], now: Optional[datetime] = None,
+                               key: Optional[bytes] = None) -> str:
         """
         Create the content for the report in Markdown format.
         
+        Sections are memoized on a hash of the analysis results, so regenerating a
+        report for the same inputs only fills the template again with a new timestamp.
+        
         Args:
             analysis_results (Dict[str, Any]): Results from the analysis pipeline
+            now (Optional[datetime]): Generation time shown in the header (defaults to the current time)
+            key (Optional[bytes]): Content hash from _content_key(); None bypasses the cache
             
         Returns:
             str: Formatted report content
         """
-        try:
-            predictions = analysis_results.get('predictions', {})
-            news_analysis = analysis_results.get('news_analysis', {})
-            social_analysis = analysis_results.get('social_analysis', {})
-            
-            report = [
-                "# Election Analysis Report",
-                f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-                
-                "## Executive Summary",
-                self._generate_executive_summary(predictions),
-                
-                "## News Analysis",
-                self._format_news_analysis(news_analysis),
-                
-                "## Social Media Analysis",
-                self._format_social_analysis(social_analysis),
-                
-                "## Predictions",
-                self._format_predictions(predictions),
-                
-                "## Methodology",
-                self._generate_methodology_section()
-            ]
+        if now is None:
+            now = datetime.now()
+        
+        cache = self._content_cache
+        sections = cache.get(key) if key is not None else None
+        
+        if sections is None:
+            sections = self._render_sections(analysis_results)
+            if key is not None:
+                cache[key] = sections
+                if len(cache) > CONTENT_CACHE_SIZE:
+                    cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        
+        return _TEMPLATE.format(timestamp=now.strftime(_HUMAN_FMT), **sections)
+    
+    def _render_sections(self, analysis_results: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Render the body of every report section.
+        
+        Args:
+            analysis_results (Dict[str, Any]): Results from the analysis pipeline
             
-            return "\n\n".join(report)
+        Returns:
+            Dict[str, str]: Section Markdown keyed by its _TEMPLATE field
+        """
+        # Missing, null or empty sections render a placeholder; anything else propagates to generate()
+        predictions = analysis_results.get('predictions') or _EMPTY_DICT
+        news_analysis = analysis_results.get('news_analysis') or _EMPTY_DICT
+        social_analysis = analysis_results.get('social_analysis') or _EMPTY_DICT
+        
+        # Look up each field once; the helpers receive plain values
+        confidence = predictions.get('confidence', 0)
+        twitter = social_analysis.get('twitter_analysis') or _EMPTY_DICT
+        
+        # Candidate lines are shared by the executive summary and the predictions section,
+        # each on its own line directly below that section's text
+        outcomes = ''.join([
+            '\n' + line for line in self._format_prediction_lines(predictions.get('predictions') or _EMPTY_DICT)
+        ])
+        
+        return {
+            'summary': self._generate_executive_summary(confidence, outcomes),
+            'news': self._format_news_analysis(
+                news_analysis.get('article_count', 0),
+                news_analysis.get('meta_analysis', 'No analysis available')
+            ) if news_analysis else _NO_NEWS_SECTION,
+            'social': self._format_social_analysis(
+                twitter.get('tweet_count', 0),
+                social_analysis.get('overall_sentiment', 0),
+                twitter.get('sentiment_analysis', 'No analysis available')
+            ) if social_analysis else _NO_SOCIAL_SECTION,
+            'predictions': self._format_predictions(confidence, outcomes) if predictions else _NO_PREDICTIONS_SECTION,
+            'methodology': self._generate_methodology_section()
+        }
+    
+    @staticmethod
+    def _content_key(analysis_results: Dict[str, Any]) -> Optional[bytes]:
+        """
+        Hash the analysis results for the content cache.
+        
+        Args:
+            analysis_results (Dict[str, Any]): Results from the analysis pipeline
             
-        except Exception as e:
-            self.logger.error(f"Error creating report content: {str(e)}")
-            raise
+        Returns:
+            Optional[bytes]: 16-byte BLAKE2b digest, or None if the results cannot be serialized
+        """
+        try:
+            if orjson is not None:
+                data = orjson.dumps(analysis_results, option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+            else:
+                # No default=str: lossy reprs (e.g. truncated NumPy arrays) could make different results collide
+                data = json.dumps(analysis_results, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        except TypeError:
+            return None
+        return hashlib.blake2b(data, digest_size=16).digest()
     
-    def _generate_executive_summary(self, predictions: Dict[str, Any]) -> str:
+    def _generate_executive_summary(self, confidence: float, outcomes: str) -> str:
         """Generate the executive summary section."""
-        try:
-            confidence = predictions.get('confidence', 0)
-            prediction_results = predictions.get('predictions', {})
-            
-            summary = [
-                "Based on our comprehensive analysis of news and social media data,",
-                f"we predict the following election outcomes with {confidence:.1%} confidence:"
-            ]
-            
-            for candidate, probability in prediction_results.items():
-                summary.append(f"- {candidate}: {probability:.1%}")
-            
-            return "\n".join(summary)
-            
-        except Exception as e:
-            self.logger.error(f"Error generating executive summary: {str(e)}")
-            return "Error generating executive summary"
+        return f"""Based on our comprehensive analysis of news and social media data,
+we predict the following election outcomes with {confidence:.1%} confidence:{outcomes}"""
     
-    def _format_news_analysis(self, news_analysis: Dict[str, Any]) -> str:
+    def _format_news_analysis(self, article_count: int, findings: str) -> str:
         """Format the news analysis section."""
-        try:
-            return f"""### Overview
-- Number of articles analyzed: {news_analysis.get('article_count', 0)}
+        return f"""### Overview
+- Number of articles analyzed: {article_count}
 
 ### Key Findings
-{news_analysis.get('meta_analysis', 'No analysis available')}"""
-            
-        except Exception as e:
-            self.logger.error(f"Error formatting news analysis: {str(e)}")
-            return "Error formatting news analysis"
+{findings}"""
     
-    def _format_social_analysis(self, social_analysis: Dict[str, Any]) -> str:
+    def _format_social_analysis(self, tweet_count: int, sentiment: float, findings: str) -> str:
         """Format the social media analysis section."""
-        try:
-            twitter = social_analysis.get('twitter_analysis', {})
-            
-            return f"""### Twitter Analysis
-- Number of tweets analyzed: {twitter.get('tweet_count', 0)}
-- Overall sentiment: {social_analysis.get('overall_sentiment', 0):.2f}
+        return f"""### Twitter Analysis
+- Number of tweets analyzed: {tweet_count}
+- Overall sentiment: {sentiment:.2f}
 
 ### Key Findings
-{twitter.get('sentiment_analysis', 'No analysis available')}"""
-            
-        except Exception as e:
-            self.logger.error(f"Error formatting social analysis: {str(e)}")
-            return "Error formatting social analysis"
+{findings}"""
     
-    def _format_predictions(self, predictions: Dict[str, Any]) -> str:
+    def _format_predictions(self, confidence: float, outcomes: str) -> str:
         """Format the predictions section."""
-        try:
-            results = predictions.get('predictions', {})
-            confidence = predictions.get('confidence', 0)
-            
-            prediction_lines = [
-                f"### Prediction Confidence: {confidence:.1%}",
-                "",
-                "### Predicted Outcomes"
-            ]
-            
-            for candidate, probability in results.items():
-                prediction_lines.append(f"- {candidate}: {probability:.1%}")
-            
-            return "\n".join(prediction_lines)
+        return f"### Prediction Confidence: {confidence:.1%}\n\n### Predicted Outcomes{outcomes}"
+    
+    def _format_prediction_lines(self, results: Dict[str, float]) -> List[str]:
+        """
+        Format each candidate's predicted probability as a Markdown list item.
+        
+        Args:
+            results (Dict[str, float]): Candidate name to win probability
             
-        except Exception as e:
-            self.logger.error(f"Error formatting predictions: {str(e)}")
-            return "Error formatting predictions"
+        Returns:
+            List[str]: One "- name: pct" line per candidate
+        """
+        return [f"- {candidate}: {probability:.1%}" for candidate, probability in results.items()]
     
     def _generate_methodology_section(self) -> str:
         """Generate the methodology section."""
-        return """Our analysis combines multiple data sources and advanced AI techniques:
+        return _METHODOLOGY
 
-1. **Data Collection**
-   - News articles from major publications
-   - Social media posts and engagement metrics
-   
-2. **Analysis Techniques**
-   - Natural Language Processing for content analysis
-   - Sentiment Analysis
-   - Topic Modeling
-   
-3. **Prediction Model**
-   - Machine Learning-based prediction
-   - Confidence scoring based on data quality and coverage"""
\ No newline at end of file
+def _generate_one(job: Tuple[bool, bool, Path, Dict[str, Any], int]) -> str:
+    """
+    Generate a single report in a generate_many() worker process.
+    
+    Args:
+        job (Tuple[bool, bool, Path, Dict[str, Any], int]): Pretty flag, JSON sidecar flag,
+            report directory, analysis results and batch index
+    
+    Returns:
+        str: Path to the generated report file
+    """
+    pretty, json_sidecar, report_dir, analysis_results, batch_index = job
+    generator = ReportGenerator(pretty=pretty, report_dir=report_dir, json_sidecar=json_sidecar)
+    return generator.generate(analysis_results, batch_index=batch_index)
+
+def _write_bytes(path: Path, data: bytes):
+    """Write encoded bytes straight to a file descriptor, bypassing the Python IO stack."""
+    payload = memoryview(data)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        for offset in range(0, len(payload), WRITE_CHUNK_SIZE):
+            chunk = payload[offset:offset + WRITE_CHUNK_SIZE]
+            while chunk:
+                chunk = chunk[os.write(fd, chunk):]
+    finally:
+        os.close(fd)
+
+def _encode_numpy(obj: Any) -> Any:
+    """msgspec hook converting NumPy arrays and scalars to native Python values."""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise NotImplementedError(f"Objects of type {type(obj).__name__} are not supported")